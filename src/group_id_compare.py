@@ -1,24 +1,31 @@
 #!/usr/bin/python3
 
 import argparse
-import pandas as pd
+import csv
+import json
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 """
 Description:
     Parses command-line arguments for base and compare files, file type, and property names.
 Arguments:
-    None (arguments are provided via the command line).
+    argv (list, optional): The arguments to parse, without the program name. Defaults to the command line (sys.argv[1:]).
 Returns:
-    argparse.Namespace: Parsed arguments for base_file, compare_file, file type, and property_names.
+    argparse.Namespace: Parsed arguments for base_file, compare_file, file type, property_names, output, verbose and mapping_file.
 """
-def get_cli_arguments():
+def get_cli_arguments(argv=None):
     parser = argparse.ArgumentParser(description="Compare groupings of identifiers between two files.")
     parser.add_argument('-base_file', required=True, help="Path to the base (golden) file")
     parser.add_argument('-compare_file', required=True, help="Path to the file to compare against")
     parser.add_argument('-type', required=True, choices=['csv', 'txt'], help="File type: 'csv' or 'txt'")
     parser.add_argument('-property_names', nargs='+', required=True, help="Property names: 2 for CSV, 1 for TXT")
     parser.add_argument('-output', required=False, help="Optional: Output file to save the terminal result")
-    return parser.parse_args()
+    parser.add_argument('-v', '-verbose', dest='verbose', action='store_true', help="Optional: Print the full Group ID mapping")
+    parser.add_argument('-mapping_file', required=False, help="Optional: JSON file to save the Group ID mapping")
+    return parser.parse_args(argv)
 
 """
 Description:
@@ -64,84 +71,242 @@ def validate_input_files(args):
 
 """
 Description:
-    Loads and validates the CSV file, ensuring the required identifier and group columns exist.
-    Creates a dictionary mapping identifiers to their corresponding group IDs.
+    Reads and validates the CSV file, ensuring the required identifier and group columns exist.
+    Streams the (identifier, group ID) pairs of its rows, holding at most one block of the file in memory at a time.
+    Uses pyarrow's multithreaded CSV parser when pyarrow is installed, and the csv module otherwise.
 Arguments:
     file_path (str): Path to the CSV file.
     identifier_column (str): Column name for identifiers (e.g., Identifier_ID).
     group_column (str): Column name for group IDs (e.g., Group_ID).
-Returns:
-    dict: A dictionary mapping identifiers to group IDs.
+Yields:
+    tuple: (identifier, group ID) for each row of the file.
 Raises:
     ValueError: If the file does not contain the required columns or there is an issue reading the file.
-""" 
-def load_and_validate_csv(file_path, identifier_column, group_column):
+"""
+def read_csv_identifier_groups(file_path, identifier_column, group_column):
+    try:
+        # pyarrow is optional and only imported when a CSV file is actually read
+        try:
+            identifier_group_pairs = read_csv_pairs_with_pyarrow(file_path, identifier_column, group_column)
+        except ImportError:
+            identifier_group_pairs = read_csv_pairs_with_csv_module(file_path, identifier_column, group_column)
+
+        is_row_found = False
+        for identifier, group_id in identifier_group_pairs:
+            # Intern the strings so repeated group IDs share one object and later hashing/equality checks are cheap
+            yield sys.intern(identifier), sys.intern(group_id)
+            is_row_found = True
+
+        # Check if the file had no rows
+        if not is_row_found:
+            raise ValueError(f"The CSV file '{file_path}' is empty.")
+
+    except Exception as e:
+        raise ValueError(f"Error loading or validating CSV file '{file_path}': {str(e)}")
+
+"""
+Description:
+    Opens the CSV file with pyarrow's streaming reader, whose C++ parser splits the file into blocks and parses
+    them on multiple threads. Only the two required columns are converted, as strings.
+    Files that pyarrow cannot parse, such as files with rows of varying length, are read with the csv module instead.
+Arguments:
+    file_path (str): Path to the CSV file.
+    identifier_column (str): Column name for identifiers (e.g., Identifier_ID).
+    group_column (str): Column name for group IDs (e.g., Group_ID).
+Returns:
+    iterator: (identifier, group ID) pairs for the rows of the file.
+Raises:
+    ImportError: If pyarrow is not installed.
+    ValueError: If the file does not contain the required columns.
+"""
+def read_csv_pairs_with_pyarrow(file_path, identifier_column, group_column):
+    import pyarrow
+    from pyarrow import csv as arrow_csv
+
+    try:
+        reader = arrow_csv.open_csv(
+            file_path,
+            read_options=arrow_csv.ReadOptions(use_threads=True),
+            convert_options=arrow_csv.ConvertOptions(
+                include_columns=[identifier_column, group_column],
+                column_types={identifier_column: pyarrow.string(), group_column: pyarrow.string()}))
+    except KeyError:
+        # pyarrow raises a KeyError subclass for columns missing from the header
+        raise ValueError(f"CSV file must contain '{identifier_column}' and '{group_column}' columns.")
+    except pyarrow.ArrowInvalid:
+        # The first block could not be parsed, e.g. a row has more or fewer columns than the header
+        return read_csv_pairs_with_csv_module(file_path, identifier_column, group_column)
+
+    return read_csv_batch_pairs_with_pyarrow(reader, file_path, identifier_column, group_column)
+
+"""
+Description:
+    Streams the identifier and group columns of the record batches read by pyarrow, one batch at a time.
+    If a later block cannot be parsed, continues with the csv module from the first row not yet streamed.
+Arguments:
+    reader (pyarrow.csv.CSVStreamingReader): The streaming reader opened on the CSV file.
+    file_path (str): Path to the CSV file.
+    identifier_column (str): Column name for identifiers (e.g., Identifier_ID).
+    group_column (str): Column name for group IDs (e.g., Group_ID).
+Yields:
+    tuple: (identifier, group ID) for each row of the file.
+Raises:
+    ValueError: If the file contains missing values in the required columns.
+"""
+def read_csv_batch_pairs_with_pyarrow(reader, file_path, identifier_column, group_column):
+    import pyarrow
+
+    rows_read = 0
     try:
-        # Load the CSV file into a DataFrame
-        df = pd.read_csv(file_path)
-        
-        # Check if the DataFrame is empty
-        if df.empty:
+        for batch in reader:
+            identifiers = batch.column(identifier_column).to_pylist()
+            group_ids = batch.column(group_column).to_pylist()
+
+            # Check for missing values
+            if "" in identifiers or "" in group_ids:
+                raise ValueError(f"CSV file '{file_path}' contains missing values in required columns.")
+
+            yield from zip(identifiers, group_ids)
+            rows_read += batch.num_rows
+    except pyarrow.ArrowInvalid:
+        # Both readers skip blank lines, so the csv module reaches the same row after skipping the rows already read
+        yield from islice(read_csv_pairs_with_csv_module(file_path, identifier_column, group_column), rows_read, None)
+
+"""
+Description:
+    Streams the identifier and group columns of the CSV file row by row with the csv module.
+Arguments:
+    file_path (str): Path to the CSV file.
+    identifier_column (str): Column name for identifiers (e.g., Identifier_ID).
+    group_column (str): Column name for group IDs (e.g., Group_ID).
+Yields:
+    tuple: (identifier, group ID) for each row of the file.
+Raises:
+    ValueError: If the file does not contain the required columns or contains missing values in them.
+"""
+def read_csv_pairs_with_csv_module(file_path, identifier_column, group_column):
+    # utf-8-sig drops the byte order mark that spreadsheet exports put in front of the header
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+
+        # Check if the file is empty; blank lines before the header are skipped, as they are after it
+        header = next((row for row in reader if row), None)
+        if header is None:
             raise ValueError(f"The CSV file '{file_path}' is empty.")
-        
+
         # Check if the required columns are present
-        if identifier_column not in df.columns or group_column not in df.columns:
+        if identifier_column not in header or group_column not in header:
             raise ValueError(f"CSV file must contain '{identifier_column}' and '{group_column}' columns.")
 
-        # Check for missing values
-        if df[identifier_column].isnull().any() or df[group_column].isnull().any():
-            raise ValueError(f"CSV file '{file_path}' contains missing values in required columns.")
-        
-        # Create a dictionary mapping identifiers to group IDs
-        return dict(zip(df[identifier_column], df[group_column]))
+        identifier_index = header.index(identifier_column)
+        group_index = header.index(group_column)
+        min_row_length = max(identifier_index, group_index) + 1
 
-    except Exception as e:
-        raise ValueError(f"Error loading or validating CSV file '{file_path}': {str(e)}")
+        for row in reader:
+            # Skip blank lines
+            if not row:
+                continue
+
+            # Check for missing values
+            if len(row) < min_row_length or not row[identifier_index] or not row[group_index]:
+                raise ValueError(f"CSV file '{file_path}' contains missing values in required columns.")
+
+            yield row[identifier_index], row[group_index]
 
 """
 Description:
-    Loads and validates the TXT file, ensuring that it contains the user-specified identifier and group properties.
+    Loads and validates the CSV file, ensuring the required identifier and group columns exist.
     Creates a dictionary mapping identifiers to their corresponding group IDs.
 Arguments:
-    file_path (str): Path to the TXT file.
-    identifier_property (str): The property name that defines the identifier (e.g., Identifier_ID).
-    group_property (str): The property name that defines the group ID in the file (e.g., Class_id).
+    file_path (str): Path to the CSV file.
+    identifier_column (str): Column name for identifiers (e.g., Identifier_ID).
+    group_column (str): Column name for group IDs (e.g., Group_ID).
 Returns:
     dict: A dictionary mapping identifiers to group IDs.
+Raises:
+    ValueError: If the file does not contain the required columns or there is an issue reading the file.
+""" 
+def load_and_validate_csv(file_path, identifier_column, group_column):
+    return dict(read_csv_identifier_groups(file_path, identifier_column, group_column))
+
+"""
+Description:
+    Reads and validates the TXT file, ensuring that it contains the user-specified identifier and group properties.
+    Streams one (identifier, group ID) pair per identifier block that contains the group property; if a block
+    lists the group property more than once, the last value is used.
+Arguments:
+    file_path (str): Path to the TXT file.
+    group_property (str): The property name that defines the group ID in the file (e.g., Class_id).
+Yields:
+    tuple: (identifier, group ID) for each identifier block of the file.
 Raises:
     ValueError: If the file does not contain valid identifiers or the specified group property.
 """
-def load_and_validate_txt(file_path, group_property):
-    identifier_group_mapping = {}
+def read_txt_identifier_groups(file_path, group_property):
     current_identifier = None
+    current_group_id = None
     is_group_property_found = False
 
     try:
+        # Build the group property prefix once rather than on every line
+        group_prefix = f"{group_property}:"
+
         with open(file_path, 'r') as f:
             for line in f:
-                line = line.strip()
-
-                # Check if it's an identifier line (no colon)
-                if ":" not in line and line != "":
-                    current_identifier = line
-
-                # Check for the group property
-                elif line.startswith(f"{group_property}:") and current_identifier:
-                    group_id = line.split(":")[1].strip()  # Extract the group ID
-                    identifier_group_mapping[current_identifier] = group_id
+                # Check for the group property; other property lines are skipped without building a stripped copy
+                if ":" in line:
+                    # If group property is found without an identifier
+                    if not current_identifier:
+                        raise ValueError(f"Identifier missing before '{group_property}' in the file.")
+
+                    if group_prefix not in line:
+                        continue
+                    line = line.lstrip()
+                    if not line.startswith(group_prefix):
+                        continue
+
+                    # Extract the group ID (the text between the first and any second colon) without building a list
+                    _, _, value = line.partition(":")
+                    current_group_id = sys.intern(value.partition(":")[0].strip())
                     is_group_property_found = True
 
-                # If group property is found without an identifier
-                if not current_identifier:
-                    raise ValueError(f"Identifier missing before '{group_property}' in the file.")
+                # Check if it's an identifier line (no colon); it closes the previous identifier's block
+                else:
+                    line = line.strip()
+                    if line:
+                        if current_group_id is not None:
+                            yield current_identifier, current_group_id
+                            current_group_id = None
+                        current_identifier = sys.intern(line)
+
+                    # If a blank line comes before any identifier
+                    elif not current_identifier:
+                        raise ValueError(f"Identifier missing before '{group_property}' in the file.")
 
         if not is_group_property_found:
             raise ValueError(f"File '{file_path}' does not contain the specified group property: '{group_property}'.")
 
+        # Emit the last identifier's block
+        if current_group_id is not None:
+            yield current_identifier, current_group_id
+
     except Exception as e:
         raise ValueError(f"Error validating and parsing TXT file '{file_path}': {str(e)}")
 
-    return identifier_group_mapping
+"""
+Description:
+    Loads and validates the TXT file, ensuring that it contains the user-specified identifier and group properties.
+    Creates a dictionary mapping identifiers to their corresponding group IDs.
+Arguments:
+    file_path (str): Path to the TXT file.
+    group_property (str): The property name that defines the group ID in the file (e.g., Class_id).
+Returns:
+    dict: A dictionary mapping identifiers to group IDs.
+Raises:
+    ValueError: If the file does not contain valid identifiers or the specified group property.
+"""
+def load_and_validate_txt(file_path, group_property):
+    return dict(read_txt_identifier_groups(file_path, group_property))
 
 """
 Description:
@@ -156,80 +321,110 @@ Returns:
             - False and None if groupings do not match.
 """
 def compare_identifier_groups(base_identifier_group_map, compare_identifier_group_map):
-    grouped_identifiers_base = group_identifiers_by_group_id(base_identifier_group_map)
-    grouped_identifiers_compare = group_identifiers_by_group_id(compare_identifier_group_map)
+    # Groupings can only match if both files contain exactly the same identifiers
+    if (len(base_identifier_group_map) != len(compare_identifier_group_map)
+            or base_identifier_group_map.keys() != compare_identifier_group_map.keys()):
+        return False, None
 
-    sorted_grouped_identifiers_base = sorted(grouped_identifiers_base.values(), key=lambda x: sorted(x))
-    sorted_grouped_identifiers_compare = sorted(grouped_identifiers_compare.values(), key=lambda x: sorted(x))
-    
-    if sorted_grouped_identifiers_base == sorted_grouped_identifiers_compare:
-        # Return True and the Group ID mapping
-        group_id_mapping = create_group_id_mapping(grouped_identifiers_base, grouped_identifiers_compare)
-        return True, group_id_mapping
-    else:
+    # Groupings can only match if both files have the same number of groups
+    base_group_count = len(set(base_identifier_group_map.values()))
+    if base_group_count != len(set(compare_identifier_group_map.values())):
         return False, None
 
+    # When every identifier is its own group, or all identifiers share one group, the groupings match without
+    # building any identifier sets, and the Group IDs pair up through the shared identifiers
+    if base_group_count == len(base_identifier_group_map) or base_group_count == 1:
+        group_id_mapping = {base_identifier_group_map[identifier]: compare_identifier_group_map[identifier]
+                            for identifier in base_identifier_group_map}
+        return True, group_id_mapping
+
+    return compare_grouped_identifiers(group_identifiers_by_group_id(base_identifier_group_map),
+                                       group_identifiers_by_group_id(compare_identifier_group_map))
+
 """
 Description:
-    Creates a mapping of Group IDs between the base file and the comparison file.
-    The function compares the sets of identifiers in the base file and the comparison file,
-    and maps the corresponding Group IDs if the identifier sets match.
-
+    Compares the groupings of identifiers between the base file and the comparison file, given the identifiers
+    already grouped by group ID. Ignores the actual Group IDs and only checks whether the sets of identifiers match.
+    This is the general case of compare_identifier_groups, used once its shortcuts do not apply.
 Arguments:
-    base_group (dict): A dictionary mapping Group IDs to sets of identifiers from the base file (Group ID -> {Set of Identifiers}).
-    compare_group (dict): A dictionary mapping Group IDs to sets of identifiers from the comparison file (Group ID -> {Set of Identifiers}).
-
+    base_group (dict): The groups from the base file (Group ID -> {Frozenset of identifiers}).
+    compare_group (dict): The groups from the compare file (Group ID -> {Frozenset of identifiers}).
 Returns:
-    dict: A dictionary mapping Group IDs from the base file to Group IDs from the comparison file (Base Group ID -> Comparison Group ID).
+        tuple: (bool, dict or None)
+            - True and the Group ID mapping if groupings match.
+            - False and None if groupings do not match.
 """
-def create_group_id_mapping(base_group, compare_group):
-    group_mapping = {}
-    for base_id, base_identifiers in base_group.items():
-        for compare_id, compare_identifiers in compare_group.items():
-            if base_identifiers == compare_identifiers:
-                group_mapping[base_id] = compare_id
-    return group_mapping
+def compare_grouped_identifiers(base_group, compare_group):
+    # Groupings can only match if both files have the same number of groups
+    if len(base_group) != len(compare_group):
+        return False, None
+
+    group_ids_base = group_ids_by_identifier_set(base_group)
+    group_ids_compare = group_ids_by_identifier_set(compare_group)
+
+    # The groupings match when both files produce the same identifier sets
+    if group_ids_base.keys() != group_ids_compare.keys():
+        return False, None
+
+    # Return True and the Group ID mapping, pairing the Group IDs that share an identifier set
+    group_id_mapping = {group_ids_base[identifiers]: group_ids_compare[identifiers] for identifiers in group_ids_base}
+    return True, group_id_mapping
 
 """
 Description:
-    Inverts a dictionary to group identifiers by their group IDs, returning a mapping of group IDs to sets of identifiers.
+    Inverts a dictionary to group identifiers by their group IDs, returning a mapping of group IDs to frozensets of identifiers.
 Arguments:
     group_map (dict): A dictionary mapping identifiers to group IDs (identifier -> group ID).
 Returns:
-    dict: A dictionary mapping group IDs to sets of identifiers (Group ID -> {Set of identifiers}).
+    dict: A dictionary mapping group IDs to frozensets of identifiers (Group ID -> {Frozenset of identifiers}).
 """
 def group_identifiers_by_group_id(group_map):
-    inverted_map = {}
+    # Collect identifiers in lists first, then build each group's frozenset in a single pass
+    identifier_buckets = defaultdict(list)
     for identifier, group_id in group_map.items():
-        if group_id not in inverted_map:
-            inverted_map[group_id] = set()
-        inverted_map[group_id].add(identifier)
-    return inverted_map
+        identifier_buckets[group_id].append(identifier)
+    return {group_id: frozenset(identifiers) for group_id, identifiers in identifier_buckets.items()}
+
+"""
+Description:
+    Indexes the groups of a file by their identifier sets, so that two files can be compared and their Group IDs
+    paired with dict lookups. Each identifier belongs to exactly one group, so every identifier set is a unique key.
+Arguments:
+    grouped_identifiers (dict): A dictionary mapping group IDs to frozensets of identifiers (Group ID -> {Frozenset of identifiers}).
+Returns:
+    dict: A dictionary mapping frozensets of identifiers to group IDs ({Frozenset of identifiers} -> Group ID).
+"""
+def group_ids_by_identifier_set(grouped_identifiers):
+    return {identifiers: group_id for group_id, identifiers in grouped_identifiers.items()}
 
 """
 Description:
     Main function to handle command-line argument parsing and the overall comparison process between base and comparison files.
     Loads the appropriate files (CSV or TXT), compares the groupings, and prints the result (success or failure).
 Arguments:
-    None (arguments are provided via the command line).
+    argv (list, optional): The command-line arguments, without the program name. Defaults to sys.argv[1:].
 Returns:
     None.
 """        
-def main():
-    args = get_cli_arguments()
+def main(argv=None):
+    args = get_cli_arguments(argv)
 
     # Call the validation function to validate the inpute files before proceeding
     validate_input_files(args)
 
-    # Handling CSV files
-    if args.type == 'csv':
-        base_identifier_to_group_map = load_and_validate_csv(args.base_file, args.property_names[0], args.property_names[1])
-        compare_identifier_to_group_map = load_and_validate_csv(args.compare_file, args.property_names[0], args.property_names[1])
+    # Load the base and comparison files concurrently, since they share no state
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Handling CSV files
+        if args.type == 'csv':
+            base_future = executor.submit(load_and_validate_csv, args.base_file, args.property_names[0], args.property_names[1])
+            compare_future = executor.submit(load_and_validate_csv, args.compare_file, args.property_names[0], args.property_names[1])
 
-    # Handling TXT files
-    elif args.type == 'txt':
-        base_identifier_to_group_map = load_and_validate_txt(args.base_file, args.property_names[0])
-        compare_identifier_to_group_map = load_and_validate_txt(args.compare_file, args.property_names[0])
+        # Handling TXT files
+        elif args.type == 'txt':
+            base_future = executor.submit(load_and_validate_txt, args.base_file, args.property_names[0])
+            compare_future = executor.submit(load_and_validate_txt, args.compare_file, args.property_names[0])
+
+        base_identifier_to_group_map, compare_identifier_to_group_map = base_future.result(), compare_future.result()
 
     # Compare groupings and get the result and mappings
     result, group_id_mapping = compare_identifier_groups(base_identifier_to_group_map, compare_identifier_to_group_map)
@@ -238,18 +433,27 @@ def main():
     output_message = ""
     if result:
         output_message += "Success: Groupings match!\n"
-        output_message += f"Group ID Mapping: {group_id_mapping}\n"
+        if args.verbose:
+            # json.dumps serializes in C, which is much faster than the dict repr for large mappings
+            output_message += f"Group ID Mapping: {json.dumps(group_id_mapping)}\n"
+        else:
+            output_message += f"Group ID Mapping: {len(group_id_mapping)} groups mapped (use -verbose to print it)\n"
     else:
         output_message += "Failure: Groupings do not match!\n"
-    
-    # Print to terminal
-    print(output_message)
-    
+
+    # Print to terminal in a single write
+    sys.stdout.write(output_message)
+
     # If the user provides an output file, save the result
     if args.output:
         with open(args.output, 'w') as f:
             f.write(output_message)
 
+    # If the user provides a mapping file, save the Group ID mapping as JSON
+    if result and args.mapping_file:
+        with open(args.mapping_file, 'w') as f:
+            f.write(json.dumps(group_id_mapping))
+
     exit(0 if result else 1)
 
 
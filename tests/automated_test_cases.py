@@ -1,41 +1,38 @@
 #!/usr/bin/python3
 
 import pytest
-import os
-import sys
-sys.path.append('../src')
+import json
+import group_id_compare
 from group_id_compare import (
     main, validate_input_files, load_and_validate_csv, load_and_validate_txt,
-    compare_identifier_groups, group_identifiers_by_group_id, create_group_id_mapping
+    compare_identifier_groups, group_identifiers_by_group_id,
+    group_ids_by_identifier_set, compare_grouped_identifiers
+)
+from paths import (
+    BASE_CSV, COMPARE_CSV, COMPARE_DIFF_CSV, BASE_TXT, COMPARE_TXT, DUPLICATE_IDENTIFIER_CSV,
+    DUPLICATE_IDENTIFIER_TXT, BOM_CSV, LEADING_BLANK_LINES_CSV, RAGGED_ROWS_CSV, EMPTY_CSV, EMPTY_TXT,
+    EXTRA_COLUMN_CSV, INCORRECT_GROUP_PROPERTY_TXT, INVALID_CSV, INVALID_TXT, INVALID_FORMAT_TXT,
+    MALFORMED_CSV, MISSING_IDENTIFIER_TXT, SINGLE_IDENTIFIER_TXT, SINGLETON_GROUPS_BASE_CSV,
+    SINGLETON_GROUPS_COMPARE_CSV
 )
-
-# Define the test data directory and file paths
-TEST_DATA_DIR = "../test_data"
-BASE_CSV = os.path.join(TEST_DATA_DIR, 'base_file.csv')
-COMPARE_CSV = os.path.join(TEST_DATA_DIR, 'compare_file.csv')
-COMPARE_DIFF_CSV = os.path.join(TEST_DATA_DIR, 'compare_diff_file.csv')
-BASE_TXT = os.path.join(TEST_DATA_DIR, 'base_file.txt')
-COMPARE_TXT = os.path.join(TEST_DATA_DIR, 'compare_file.txt')
 
 
 # Test Case 1: Validate CSV loading with correct data
-def test_load_and_validate_csv():
-    identifier_group_map = load_and_validate_csv(BASE_CSV, 'IdentifierID', 'GroupID')
-    assert identifier_group_map == {
-        "A": 5,
-        "B": 2,
-        "C": 3,
-        "D": 3,
-        "G": 2,
-        "K": 5,
-        "L": 4,
-        "M": 2
+def test_load_and_validate_csv(base_csv_map):
+    assert base_csv_map == {
+        "A": '5',
+        "B": '2',
+        "C": '3',
+        "D": '3',
+        "G": '2',
+        "K": '5',
+        "L": '4',
+        "M": '2'
     }
 
 # Test Case 2: Validate TXT loading with correct data
-def test_load_and_validate_txt():
-    identifier_group_map = load_and_validate_txt(BASE_TXT, 'Class_id')
-    assert identifier_group_map == {
+def test_load_and_validate_txt(base_txt_map):
+    assert base_txt_map == {
         "Pattern1": '1',
         "Pattern2": '2',
         "Pattern3": '1',
@@ -44,65 +41,86 @@ def test_load_and_validate_txt():
         "Pattern6": '2'
     }
 
-# Test Case 3: Validate error handling for CSV with missing column
-def test_load_and_validate_csv_missing_column():
-    invalid_csv = os.path.join(TEST_DATA_DIR, 'invalid_file.csv')
-    with pytest.raises(ValueError):
-        load_and_validate_csv(invalid_csv, 'IdentifierID', 'GroupID')
-
-# Test Case 4: Validate error handling for TXT with missing group property
-def test_load_and_validate_txt_missing_property():
-    invalid_txt = os.path.join(TEST_DATA_DIR, 'invalid_file.txt')
+# Test Case 3: Validate error handling for invalid input files (cases 3, 4, 12-14, 16, 18 and 19)
+@pytest.mark.parametrize("loader, file_path, property_names", [
+    # CSV with missing column
+    (load_and_validate_csv, INVALID_CSV, ('IdentifierID', 'GroupID')),
+    # TXT with missing group property
+    (load_and_validate_txt, INVALID_TXT, ('Class_id',)),
+    # Empty CSV file
+    (load_and_validate_csv, EMPTY_CSV, ('IdentifierID', 'GroupID')),
+    # Empty TXT file
+    (load_and_validate_txt, EMPTY_TXT, ('Class_id',)),
+    # Incorrect group property format in TXT
+    (load_and_validate_txt, INVALID_FORMAT_TXT, ('Class_id',)),
+    # Incorrect group property name in TXT
+    (load_and_validate_txt, INCORRECT_GROUP_PROPERTY_TXT, ('WrongProperty',)),
+    # Malformed CSV file (missing values)
+    (load_and_validate_csv, MALFORMED_CSV, ('IdentifierID', 'GroupID')),
+    # TXT with missing identifier
+    (load_and_validate_txt, MISSING_IDENTIFIER_TXT, ('Class_id',)),
+])
+def test_load_and_validate_invalid_files(loader, file_path, property_names):
     with pytest.raises(ValueError):
-        load_and_validate_txt(invalid_txt, 'Class_id')
+        loader(file_path, *property_names)
 
 # Test Case 5: Validate correct group comparison between base CSV and comparison TXT
-def test_compare_identifier_groups():
-    base_group_map = load_and_validate_txt(BASE_TXT, 'Class_id')
-    compare_group_map = load_and_validate_txt(COMPARE_TXT, 'Class_id')
-    
-    result, group_id_mapping = compare_identifier_groups(base_group_map, compare_group_map)
+def test_compare_identifier_groups(base_txt_map, compare_txt_map):
+    result, group_id_mapping = compare_identifier_groups(base_txt_map, compare_txt_map)
     assert result is True
     assert group_id_mapping == {"1": "10", "2": "36", "3": "7"}
 
 # Test Case 6: Validate group comparison failure for mismatched data
-def test_compare_identifier_groups_mismatch():
-    base_group_map = load_and_validate_csv(BASE_CSV, 'IdentifierID', 'GroupID')
-    compare_group_map = load_and_validate_txt(COMPARE_TXT, 'Class_id')
-    
-    result, group_id_mapping = compare_identifier_groups(base_group_map, compare_group_map)
+def test_compare_identifier_groups_mismatch(base_csv_map, compare_txt_map):
+    result, group_id_mapping = compare_identifier_groups(base_csv_map, compare_txt_map)
     assert result is False
     assert group_id_mapping is None
 
 # Test Case 7: Validate input files when CSV type is provided with valid arguments
-def test_validate_input_files_csv(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'csv'
-    mock_args.base_file = BASE_CSV
-    mock_args.compare_file = COMPARE_CSV
-    mock_args.property_names = ['IdentifierID', 'GroupID']
+def test_validate_input_files_csv(make_args):
+    mock_args = make_args(type='csv', base_file=str(BASE_CSV), compare_file=str(COMPARE_CSV), property_names=['IdentifierID', 'GroupID'])
     validate_input_files(mock_args)
 
 # Test Case 8: Validate input files when TXT type is provided with valid arguments
-def test_validate_input_files_txt(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'txt'
-    mock_args.base_file = BASE_TXT
-    mock_args.compare_file = COMPARE_TXT
-    mock_args.property_names = ['Class_id']
+def test_validate_input_files_txt(make_args):
+    mock_args = make_args(type='txt', base_file=str(BASE_TXT), compare_file=str(COMPARE_TXT), property_names=['Class_id'])
     validate_input_files(mock_args)
 
-# Test Case 9: Validate error handling for mismatched file types (CSV and TXT)
-def test_validate_input_files_mismatch_type(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'csv'
-    mock_args.base_file = BASE_TXT
-    mock_args.compare_file = COMPARE_CSV
-    mock_args.property_names = ['IdentifierID', 'GroupID']
-    
-    with pytest.raises(SystemExit):
+# Test Case 9: Validate error handling for invalid arguments (cases 9, 21 and 26-31)
+@pytest.mark.parametrize("file_type, base_file, compare_file, property_names, expected_message", [
+    # Mismatched file types (CSV and TXT)
+    ('csv', str(BASE_TXT), str(COMPARE_CSV), ['IdentifierID', 'GroupID'],
+     "Error: The file type is specified as CSV, but one or both input files do not have a .csv extension."),
+    # Invalid argument for file type (non-txt or csv)
+    ('invalid_type', str(BASE_CSV), str(COMPARE_CSV), ['IdentifierID', 'GroupID'],
+     "Error: Unsupported file type. Please specify 'csv' or 'txt'."),
+    # Invalid file extension for CSV
+    ('csv', 'base_file.txt', 'compare_file.csv', ['IdentifierID', 'GroupID'],
+     "Error: The file type is specified as CSV, but one or both input files do not have a .csv extension."),
+    # Missing property name
+    ('txt', str(BASE_TXT), str(COMPARE_TXT), [],
+     "Error: Property names are missing."),
+    # TXT base and CSV compare files
+    ('txt', 'base_file.txt', 'compare_file.csv', ['Class_id'],
+     "Error: The file type is specified as TXT, but one or both input files do not have a .txt extension."),
+    # Invalid extension for TXT
+    ('txt', 'base_file.csv', 'compare_file.txt', ['Class_id'],
+     "Error: The file type is specified as TXT, but one or both input files do not have a .txt extension."),
+    # CSV with only one property name
+    ('csv', 'base_file.csv', 'compare_file.csv', ['IdentifierID'],
+     "Error: CSV files should have exactly 2 property names (identifier and group property)."),
+])
+def test_validate_input_files_invalid_arguments(mocker, make_args, file_type, base_file, compare_file, property_names, expected_message):
+    mock_args = make_args(type=file_type, base_file=base_file, compare_file=compare_file, property_names=property_names)
+
+    mock_print = mocker.patch('builtins.print')
+    with pytest.raises(SystemExit) as e:
         validate_input_files(mock_args)
 
+    # Check that the correct error message was printed
+    mock_print.assert_called_with(expected_message)
+    assert e.value.code == 1  # Ensure it exits with code 1
+
 # Test Case 10: Test grouping of identifiers by group ID
 def test_group_identifiers_by_group_id():
     identifier_group_map = {
@@ -117,36 +135,19 @@ def test_group_identifiers_by_group_id():
     }
 
 # Test Case 11: Test creating group ID mapping between base and comparison files
-def test_create_group_id_mapping():
+def test_group_id_mapping_from_grouped_identifiers():
     base_group = {
-        "1": {"Pattern1", "Pattern3"},
-        "2": {"Pattern2"}
+        "1": frozenset({"Pattern1", "Pattern3"}),
+        "2": frozenset({"Pattern2"})
     }
     compare_group = {
-        "1": {"Pattern1", "Pattern3"},
-        "2": {"Pattern2"}
+        "1": frozenset({"Pattern1", "Pattern3"}),
+        "2": frozenset({"Pattern2"})
     }
-    mapping = create_group_id_mapping(base_group, compare_group)
+    result, mapping = compare_grouped_identifiers(base_group, compare_group)
+    assert result is True
     assert mapping == {"1": "1", "2": "2"}
 
-# Test Case 12: Validate empty CSV file handling
-def test_load_and_validate_empty_csv():
-    empty_csv = os.path.join(TEST_DATA_DIR, 'empty_file.csv')
-    with pytest.raises(ValueError):
-        load_and_validate_csv(empty_csv, 'IdentifierID', 'GroupID')
-
-# Test Case 13: Validate empty TXT file handling
-def test_load_and_validate_empty_txt():
-    empty_txt = os.path.join(TEST_DATA_DIR, 'empty_file.txt')
-    with pytest.raises(ValueError):
-        load_and_validate_txt(empty_txt, 'Class_id')
-
-# Test Case 14: Validate incorrect group property format in TXT
-def test_load_and_validate_txt_invalid_format():
-    invalid_format_txt = os.path.join(TEST_DATA_DIR, 'invalid_format_file.txt')
-    with pytest.raises(ValueError):
-        load_and_validate_txt(invalid_format_txt, 'Class_id')
-
 # Test Case 15: Validate mismatched group ID formats (string vs integer)
 def test_compare_identifier_groups_mismatched_group_id_format():
     base_group_map = {
@@ -163,163 +164,209 @@ def test_compare_identifier_groups_mismatched_group_id_format():
     assert result is True
     assert group_id_mapping == {"1": "1", "2": "2"}
 
-# Test Case 16: Validate error handling for incorrect group property name in TXT
-def test_load_and_validate_txt_incorrect_group_property():
-    invalid_group_property_txt = os.path.join(TEST_DATA_DIR, 'incorrect_group_property.txt')
-    with pytest.raises(ValueError):
-        load_and_validate_txt(invalid_group_property_txt, 'WrongProperty')
-
 # Test Case 17: CSV with extra, unexpected columns
 def test_load_and_validate_csv_extra_columns():
-    extra_column_csv = os.path.join(TEST_DATA_DIR, 'extra_column_file.csv')
-    identifier_group_map = load_and_validate_csv(extra_column_csv, 'IdentifierID', 'GroupID')
+    identifier_group_map = load_and_validate_csv(EXTRA_COLUMN_CSV, 'IdentifierID', 'GroupID')
     assert identifier_group_map == {
-        "A": 1,
-        "B": 2,
-        "C": 1
+        "A": '1',
+        "B": '2',
+        "C": '1'
     }
 
-# Test Case 18: Malformed CSV file (missing values)
-def test_load_and_validate_csv_malformed():
-    malformed_csv = os.path.join(TEST_DATA_DIR, 'malformed_file.csv')
-    with pytest.raises(ValueError):
-        load_and_validate_csv(malformed_csv, 'IdentifierID', 'GroupID')
-
-# Test Case 19: TXT with missing identifier
-def test_load_and_validate_txt_missing_identifier():
-    missing_identifier_txt = os.path.join(TEST_DATA_DIR, 'missing_identifier_file.txt')
-    with pytest.raises(ValueError):
-        load_and_validate_txt(missing_identifier_txt, 'Class_id')
-
 # Test Case 20: TXT with only one identifier
 def test_load_and_validate_txt_single_identifier():
-    single_identifier_txt = os.path.join(TEST_DATA_DIR, 'single_identifier_file.txt')
-    identifier_group_map = load_and_validate_txt(single_identifier_txt, 'Class_id')
+    identifier_group_map = load_and_validate_txt(SINGLE_IDENTIFIER_TXT, 'Class_id')
     assert identifier_group_map == {
         "Pattern1": "1"
     }
 
-# Test Case 21: Invalid argument for file type (non-txt or csv)
-def test_validate_input_files_invalid_type(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'invalid_type'
-    mock_args.base_file = BASE_CSV
-    mock_args.compare_file = COMPARE_CSV
-    mock_args.property_names = ['IdentifierID', 'GroupID']
-
-    with pytest.raises(SystemExit):
-        validate_input_files(mock_args)
-
 # Test Case 22: Main function successful execution for CSV
 def test_main_csv_pos_execution(mocker):
-    mocker.patch('sys.argv', ['group_id_compare.py', '-type', 'csv', '-base_file', BASE_CSV, '-compare_file', COMPARE_CSV, '-property_names', 'IdentifierID', 'GroupID'])
+    argv = ['-type', 'csv', '-base_file', str(BASE_CSV), '-compare_file', str(COMPARE_CSV), '-property_names', 'IdentifierID', 'GroupID']
     mocker.patch('group_id_compare.load_and_validate_csv', return_value={"A": 1, "B": 2, "C": 1})
     mocker.patch('group_id_compare.compare_identifier_groups', return_value=(True, {"1": "1", "2": "2"}))
 
     with pytest.raises(SystemExit) as e:
-        main()  # Run the main function with mocked arguments and functions
+        main(argv)  # Run the main function with the given arguments and mocked functions
     assert e.value.code == 0  # Ensure SystemExit code is 0 for success
 
 # Test Case 23: Main function failure execution for CSV
-def test_main_csv_neg_execution(mocker):
-    mocker.patch('sys.argv', ['group_id_compare.py', '-type', 'csv', '-base_file', BASE_CSV, '-compare_file', COMPARE_DIFF_CSV, '-property_names', 'IdentifierID', 'GroupID'])
+def test_main_csv_neg_execution():
+    argv = ['-type', 'csv', '-base_file', str(BASE_CSV), '-compare_file', str(COMPARE_DIFF_CSV), '-property_names', 'IdentifierID', 'GroupID']
 
     with pytest.raises(SystemExit) as e:
-        main()
+        main(argv)
     assert e.value.code == 1  # Ensure SystemExit code is 1 for failure
 
 # Test Case 24: Main function successful execution for TXT
 def test_main_txt_execution(mocker):
-    mocker.patch('sys.argv', ['group_id_compare.py', '-type', 'txt', '-base_file', BASE_TXT, '-compare_file', COMPARE_TXT, '-property_names', 'Class_id'])
+    argv = ['-type', 'txt', '-base_file', str(BASE_TXT), '-compare_file', str(COMPARE_TXT), '-property_names', 'Class_id']
     mocker.patch('group_id_compare.load_and_validate_txt', return_value={"Pattern1": '1', "Pattern2": '2', "Pattern3": '1'})
     mocker.patch('group_id_compare.compare_identifier_groups', return_value=(True, {"1": "10", "2": "36", "3": "7"}))
     
     with pytest.raises(SystemExit) as e:
-        main()  # Run the main function with mocked arguments and functions
+        main(argv)  # Run the main function with the given arguments and mocked functions
     assert e.value.code == 0  # Ensure SystemExit code is 0 for success
 
 # Test Case 25: Main function invalid file type
-def test_main_invalid_type(mocker):
-    mocker.patch('sys.argv', ['group_id_compare.py', '--type', 'invalid', '--base_file', BASE_CSV, '--compare_file', COMPARE_CSV, '--property_names', 'IdentifierID', 'GroupID'])
+def test_main_invalid_type():
+    argv = ['--type', 'invalid', '--base_file', str(BASE_CSV), '--compare_file', str(COMPARE_CSV), '--property_names', 'IdentifierID', 'GroupID']
     
     with pytest.raises(SystemExit):  # Expecting SystemExit for invalid type
-        main()
-
-# Test Case 26: Validate input files with invalid file extension for CSV
-def test_validate_input_files_invalid_file_extension(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'csv'
-    mock_args.base_file = 'base_file.txt'  # Mismatched file extension for csv type
-    mock_args.compare_file = 'compare_file.csv'
-    mock_args.property_names = ['IdentifierID', 'GroupID']
-    
-    with pytest.raises(SystemExit):  # Expecting SystemExit due to file extension mismatch
-        validate_input_files(mock_args)
+        main(argv)
 
-# Test Case 27: Validate input files with missing property name
-def test_validate_input_files_missing_property_name(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'txt'
-    mock_args.base_file = BASE_TXT
-    mock_args.compare_file = COMPARE_TXT
-    mock_args.property_names = []  # Missing property names
-    
-    with pytest.raises(SystemExit):  # Expecting SystemExit due to missing property name
-        validate_input_files(mock_args)
+# Test Case 32: Test indexing group IDs by their identifier sets
+def test_group_ids_by_identifier_set():
+    grouped_identifiers = {
+        "1": frozenset({"Pattern1", "Pattern3"}),
+        "2": frozenset({"Pattern2"})
+    }
+    indexed = group_ids_by_identifier_set(grouped_identifiers)
+    assert indexed == {
+        frozenset({"Pattern1", "Pattern3"}): "1",
+        frozenset({"Pattern2"}): "2"
+    }
 
-# Test Case 28: Validate input files with invalid type
-def test_validate_input_files_invalid_type(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'invalid_type'  # Invalid file type
-    mock_args.base_file = BASE_CSV
-    mock_args.compare_file = COMPARE_CSV
-    mock_args.property_names = ['IdentifierID', 'GroupID']
-    
-    with pytest.raises(SystemExit):  # Expecting SystemExit due to invalid file type
-        validate_input_files(mock_args)
+# Test Case 33: Validate grouping the identifiers of a loaded CSV file by group ID
+def test_group_identifiers_by_group_id_csv(base_csv_map):
+    grouped = group_identifiers_by_group_id(base_csv_map)
+    assert grouped == {
+        "5": {"A", "K"},
+        "2": {"B", "G", "M"},
+        "3": {"C", "D"},
+        "4": {"L"}
+    }
 
-# Test Case 29: Validate input files with TXT base and CSV compare files
-def test_validate_input_files_txt_base_csv_compare(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'txt'
-    mock_args.base_file = 'base_file.txt'
-    mock_args.compare_file = 'compare_file.csv'
-    mock_args.property_names = ['Class_id']
+# Test Case 34: Validate grouping the identifiers of a loaded TXT file by group ID
+def test_group_identifiers_by_group_id_txt(base_txt_map):
+    grouped = group_identifiers_by_group_id(base_txt_map)
+    assert grouped == {
+        "1": {"Pattern1", "Pattern3"},
+        "2": {"Pattern2", "Pattern6"},
+        "3": {"Pattern4", "Pattern5"}
+    }
 
-    mock_print = mocker.patch('builtins.print')  # Correctly patch the print function
-    with pytest.raises(SystemExit) as e:
-        validate_input_files(mock_args)
+# Test Case 35: Validate comparison of pre-grouped identifiers, matching and mismatching
+def test_compare_grouped_identifiers():
+    base_group = group_identifiers_by_group_id(load_and_validate_csv(BASE_CSV, 'IdentifierID', 'GroupID'))
 
-    # Check that the correct error message was printed
-    mock_print.assert_called_with("Error: The file type is specified as TXT, but one or both input files do not have a .txt extension.")
-    assert e.value.code == 1  # Ensure it exits with code 1
+    compare_group = group_identifiers_by_group_id(load_and_validate_csv(COMPARE_CSV, 'IdentifierID', 'GroupID'))
+    result, group_id_mapping = compare_grouped_identifiers(base_group, compare_group)
+    assert result is True
+    assert group_id_mapping == {"5": "36", "2": "2", "3": "7", "4": "3"}
 
-# Test Case 30: Validate input files with invalid extension for TXT
-def test_validate_input_files_invalid_extension_for_txt(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'txt'
-    mock_args.base_file = 'base_file.csv'  # Invalid extension
-    mock_args.compare_file = 'compare_file.txt'
-    mock_args.property_names = ['Class_id']
+    compare_group = group_identifiers_by_group_id(load_and_validate_csv(COMPARE_DIFF_CSV, 'IdentifierID', 'GroupID'))
+    result, group_id_mapping = compare_grouped_identifiers(base_group, compare_group)
+    assert result is False
+    assert group_id_mapping is None
+
+# Test Case 36: Validate CSV loading with the csv module when pyarrow is not installed
+def test_load_and_validate_csv_without_pyarrow(mocker):
+    mocker.patch('group_id_compare.read_csv_pairs_with_pyarrow', side_effect=ImportError)
+    identifier_group_map = load_and_validate_csv(BASE_CSV, 'IdentifierID', 'GroupID')
+    assert identifier_group_map == {
+        "A": '5',
+        "B": '2',
+        "C": '3',
+        "D": '3',
+        "G": '2',
+        "K": '5',
+        "L": '4',
+        "M": '2'
+    }
+
+    with pytest.raises(ValueError):
+        load_and_validate_csv(MALFORMED_CSV, 'IdentifierID', 'GroupID')
+
+# Test Case 37: Validate group comparison when every identifier is its own group or all share one group
+def test_compare_identifier_groups_degenerate_groupings():
+    result, group_id_mapping = compare_identifier_groups({"A": "1", "B": "2", "C": "3"}, {"C": "9", "A": "7", "B": "8"})
+    assert result is True
+    assert group_id_mapping == {"1": "7", "2": "8", "3": "9"}
+
+    result, group_id_mapping = compare_identifier_groups({"A": "1", "B": "1", "C": "1"}, {"A": "5", "B": "5", "C": "5"})
+    assert result is True
+    assert group_id_mapping == {"1": "5"}
+
+    result, group_id_mapping = compare_identifier_groups({"A": "1", "B": "2", "C": "3"}, {"A": "5", "B": "5", "C": "6"})
+    assert result is False
+    assert group_id_mapping is None
+
+# Test Case 38: Main function prints the full mapping with -verbose and saves it with -mapping_file
+def test_main_verbose_and_mapping_file(tmp_path, capsys):
+    mapping_file = tmp_path / 'mapping.json'
+    argv = ['-type', 'csv', '-base_file', str(BASE_CSV), '-compare_file', str(COMPARE_CSV), '-property_names', 'IdentifierID', 'GroupID', '-verbose', '-mapping_file', str(mapping_file)]
 
-    mock_print = mocker.patch('builtins.print')
     with pytest.raises(SystemExit) as e:
-        validate_input_files(mock_args)
+        main(argv)
+    assert e.value.code == 0
 
-    mock_print.assert_called_with("Error: The file type is specified as TXT, but one or both input files do not have a .txt extension.")
-    assert e.value.code == 1
+    expected_mapping = {"5": "36", "2": "2", "3": "7", "4": "3"}
+    assert f"Group ID Mapping: {json.dumps(expected_mapping)}" in capsys.readouterr().out
+    assert json.loads(mapping_file.read_text()) == expected_mapping
 
-# Test Case 31: Validate input files for CSV with only one property name
-def test_validate_input_files_csv_with_one_property_name(mocker):
-    mock_args = mocker.Mock()
-    mock_args.type = 'csv'
-    mock_args.base_file = 'base_file.csv'
-    mock_args.compare_file = 'compare_file.csv'
-    mock_args.property_names = ['IdentifierID']  # Only one property name
+# Test Case 39: Validate group comparison and mapping when one group is much larger than the other
+def test_compare_identifier_groups_skewed_group_sizes():
+    base_group_map = {f"Pattern{i}": "1" for i in range(1000)}
+    base_group_map["Single"] = "2"
+    compare_group_map = {identifier: ("B" if group_id == "1" else "A") for identifier, group_id in base_group_map.items()}
+
+    result, group_id_mapping = compare_identifier_groups(base_group_map, compare_group_map)
+    assert result is True
+    assert group_id_mapping == {"1": "B", "2": "A"}
+    assert compare_grouped_identifiers(group_identifiers_by_group_id(base_group_map),
+                                       group_identifiers_by_group_id(compare_group_map)) == (True, {"1": "B", "2": "A"})
+
+    # Same group sizes, but the single identifier swapped places with one identifier of the large group
+    compare_group_map["Single"], compare_group_map["Pattern0"] = "B", "A"
+    result, group_id_mapping = compare_identifier_groups(base_group_map, compare_group_map)
+    assert result is False
+    assert group_id_mapping is None
+    assert compare_grouped_identifiers(group_identifiers_by_group_id(base_group_map),
+                                       group_identifiers_by_group_id(compare_group_map)) == (False, None)
+
+# Test Case 40: Repeated identifiers keep their last group ID
+def test_load_and_validate_duplicate_identifiers():
+    assert load_and_validate_csv(DUPLICATE_IDENTIFIER_CSV, 'IdentifierID', 'GroupID') == {"A": "2", "B": "1", "C": "2"}
+    assert load_and_validate_txt(DUPLICATE_IDENTIFIER_TXT, 'Class_id') == {"Pattern1": "2", "Pattern2": "1", "Pattern3": "2"}
+
+    result, group_id_mapping = compare_identifier_groups(load_and_validate_csv(DUPLICATE_IDENTIFIER_CSV, 'IdentifierID', 'GroupID'),
+                                                         {"A": "x", "B": "y", "C": "x"})
+    assert result is True
+    assert group_id_mapping == {"2": "x", "1": "y"}
+
+# Test Case 41: CSV starting with a UTF-8 byte order mark, with and without pyarrow
+def test_load_and_validate_csv_with_bom(mocker):
+    expected_map = {"A": "1", "B": "NA", "C": "1"}
+    assert load_and_validate_csv(BOM_CSV, 'IdentifierID', 'GroupID') == expected_map
+
+    mocker.patch('group_id_compare.read_csv_pairs_with_pyarrow', side_effect=ImportError)
+    assert load_and_validate_csv(BOM_CSV, 'IdentifierID', 'GroupID') == expected_map
+
+# Test Case 42: CSV rows with fewer or more columns than the header, with and without pyarrow
+def test_load_and_validate_csv_ragged_rows(mocker):
+    expected_map = {"A": "1", "B": "2", "C": "1"}
+    assert load_and_validate_csv(RAGGED_ROWS_CSV, 'IdentifierID', 'GroupID') == expected_map
+
+    mocker.patch('group_id_compare.read_csv_pairs_with_pyarrow', side_effect=ImportError)
+    assert load_and_validate_csv(RAGGED_ROWS_CSV, 'IdentifierID', 'GroupID') == expected_map
+
+# Test Case 43: Main function pairs Group IDs directly, without grouping, when every identifier is its own group
+def test_main_singleton_groups(mocker, capsys):
+    argv = ['-type', 'csv', '-base_file', str(SINGLETON_GROUPS_BASE_CSV), '-compare_file', str(SINGLETON_GROUPS_COMPARE_CSV), '-property_names', 'IdentifierID', 'GroupID', '-verbose']
+    grouping_spy = mocker.spy(group_id_compare, 'group_identifiers_by_group_id')
 
-    mock_print = mocker.patch('builtins.print')
     with pytest.raises(SystemExit) as e:
-        validate_input_files(mock_args)
+        main(argv)
+    assert e.value.code == 0
+
+    assert f"Group ID Mapping: {json.dumps({'1': '10', '2': '20', '3': '30', '4': '40'})}" in capsys.readouterr().out
+    grouping_spy.assert_not_called()
+
+# Test Case 44: CSV with blank lines before the header, with and without pyarrow
+def test_load_and_validate_csv_leading_blank_lines(mocker):
+    expected_map = {"A": "1", "B": "2"}
+    assert load_and_validate_csv(LEADING_BLANK_LINES_CSV, 'IdentifierID', 'GroupID') == expected_map
 
-    mock_print.assert_called_with("Error: CSV files should have exactly 2 property names (identifier and group property).")
-    assert e.value.code == 1
+    mocker.patch('group_id_compare.read_csv_pairs_with_pyarrow', side_effect=ImportError)
+    assert load_and_validate_csv(LEADING_BLANK_LINES_CSV, 'IdentifierID', 'GroupID') == expected_map
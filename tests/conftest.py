@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+
+import pytest
+import sys
+# Make the tool importable from the test modules; conftest.py is loaded before any of them
+sys.path.append('../src')
+from group_id_compare import load_and_validate_csv, load_and_validate_txt
+from paths import BASE_CSV, BASE_TXT, COMPARE_TXT
+
+
+# Each shared input file is parsed once per test session and reused by every test that needs it.
+# Tests must not modify the returned dictionaries.
+@pytest.fixture(scope="session")
+def base_csv_map():
+    return load_and_validate_csv(BASE_CSV, 'IdentifierID', 'GroupID')
+
+@pytest.fixture(scope="session")
+def base_txt_map():
+    return load_and_validate_txt(BASE_TXT, 'Class_id')
+
+@pytest.fixture(scope="session")
+def compare_txt_map():
+    return load_and_validate_txt(COMPARE_TXT, 'Class_id')
+
+
+# Builds the argparse-like namespace that validate_input_files expects from keyword arguments
+@pytest.fixture
+def make_args(mocker):
+    def build_args(**kwargs):
+        mock_args = mocker.Mock()
+        for name, value in kwargs.items():
+            setattr(mock_args, name, value)
+        return mock_args
+    return build_args
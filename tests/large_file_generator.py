@@ -1,7 +1,6 @@
 #!/usr/bin/python3
 
 import numpy as np
-import pandas as pd
 
 # Define the number of rows needed to make the file large (~100MB)
 num_rows = (10**5)*5  # Adjust this to generate a large file size
@@ -10,31 +9,53 @@ num_rows = (10**5)*5  # Adjust this to generate a large file size
 num_columns = 50
 identifier_column = 'Identifier'
 
-# Generate unique identifiers (e.g., ID_0, ID_1, ..., ID_999999)
-identifiers = [f'ID_{i}' for i in range(num_rows)]
-
-# Create integer data for Column_1 with values between 0 and 100 (inclusive)
-data_1 = {f'Column_1': np.random.randint(0, 101, num_rows)}
-data_2 = {f'Column_1': np.random.randint(0, 101, num_rows)}
-
-# Create random float data for the remaining columns
-for i in range(2, num_columns + 1):
-    data_1[f'Column_{i}'] = np.random.rand(num_rows)
-    data_2[f'Column_{i}'] = np.random.rand(num_rows)
-
-# Add the Identifier column
-data_1[identifier_column] = identifiers
-data_2[identifier_column] = identifiers
-
-# Create the DataFrame
-large_df_unique_1 = pd.DataFrame(data_1)
-large_df_unique_2 = pd.DataFrame(data_2)
-
-# Save the DataFrame as a large CSV file
+# Seed of the random generator, fixed so the generated files are reproducible
+random_seed = 2024
+
+# Generate unique identifiers (e.g., ID_0, ID_1, ..., ID_999999) with NumPy's string ufuncs
+# The same array is shared by both files
+identifiers = np.char.add('ID_', np.arange(num_rows).astype(str))
+
+# Use NumPy's PCG64 Generator rather than the legacy RandomState API
+rng = np.random.default_rng(random_seed)
+
+# Create random float data for the remaining columns as a single float32 block
+float_columns = [f'Column_{i}' for i in range(2, num_columns + 1)]
+float_data = rng.random((num_rows, num_columns - 1), dtype=np.float32)
+
+# Create integer data for Column_1 with values between 0 and 100 (inclusive), which fit in a uint8
+column_1_data = rng.integers(0, 101, num_rows, dtype=np.uint8)
+
+# The diff file intentionally shares the float and Identifier columns with the first file
+# Only Column_1, the group column of the comparison, is resampled so the groupings differ
+column_1_diff_data = rng.integers(0, 101, num_rows, dtype=np.uint8)
+
+# Column order and number formats of the generated files; the float columns are only filler for the comparison,
+# so 4 significant digits keep them compact and cheap to format
+header = ','.join(['Column_1'] + float_columns + [identifier_column])
+row_format = ','.join(['%d'] + ['%.4g'] * len(float_columns) + ['%s'])
+
+# Write through a 1 MiB buffer in 50k-row blocks so each block is formatted in one np.savetxt call
+# and the file receives large, contiguous writes
+write_buffer_size = 1 << 20
+write_chunk_rows = 50_000
+
+def write_csv(file_path, column_1):
+    with open(file_path, 'w', buffering=write_buffer_size, newline='') as f:
+        f.write(header + '\n')
+        for start in range(0, num_rows, write_chunk_rows):
+            stop = min(start + write_chunk_rows, num_rows)
+            block = np.empty((stop - start, num_columns + 1), dtype=object)
+            block[:, 0] = column_1[start:stop]
+            block[:, 1:num_columns] = float_data[start:stop]
+            block[:, num_columns] = identifiers[start:stop]
+            np.savetxt(f, block, fmt=row_format)
+
+# Save the data as large CSV files
 csv_large_file_path = '../test_data/large_group_ids.csv'
 csv_large_file_diff_path = '../test_data/large_group_ids_diff.csv'
-large_df_unique_1.to_csv(csv_large_file_path, index=False)
-large_df_unique_2.to_csv(csv_large_file_diff_path)
+write_csv(csv_large_file_path, column_1_data)
+write_csv(csv_large_file_diff_path, column_1_diff_data)
 
 print(f"CSV file generated: {csv_large_file_path}")
 print(f"CSV file generated: {csv_large_file_diff_path}")
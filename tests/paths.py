@@ -0,0 +1,30 @@
+#!/usr/bin/python3
+
+from pathlib import Path
+
+# Define the test data directory and file paths once at import; shared by conftest.py and the test cases
+# The loaders accept Path objects; validate_input_files and the command line take them as strings
+TEST_DATA_DIR = Path("../test_data")
+BASE_CSV = TEST_DATA_DIR / 'base_file.csv'
+COMPARE_CSV = TEST_DATA_DIR / 'compare_file.csv'
+COMPARE_DIFF_CSV = TEST_DATA_DIR / 'compare_diff_file.csv'
+BASE_TXT = TEST_DATA_DIR / 'base_file.txt'
+COMPARE_TXT = TEST_DATA_DIR / 'compare_file.txt'
+DUPLICATE_IDENTIFIER_CSV = TEST_DATA_DIR / 'duplicate_identifier_file.csv'
+DUPLICATE_IDENTIFIER_TXT = TEST_DATA_DIR / 'duplicate_identifier_file.txt'
+BOM_CSV = TEST_DATA_DIR / 'bom_file.csv'
+LEADING_BLANK_LINES_CSV = TEST_DATA_DIR / 'leading_blank_lines_file.csv'
+RAGGED_ROWS_CSV = TEST_DATA_DIR / 'ragged_rows_file.csv'
+SINGLETON_GROUPS_BASE_CSV = TEST_DATA_DIR / 'singleton_groups_base.csv'
+SINGLETON_GROUPS_COMPARE_CSV = TEST_DATA_DIR / 'singleton_groups_compare.csv'
+EMPTY_CSV = TEST_DATA_DIR / 'empty_file.csv'
+EMPTY_TXT = TEST_DATA_DIR / 'empty_file.txt'
+EXTRA_COLUMN_CSV = TEST_DATA_DIR / 'extra_column_file.csv'
+INCORRECT_GROUP_PROPERTY_TXT = TEST_DATA_DIR / 'incorrect_group_property.txt'
+INVALID_CSV = TEST_DATA_DIR / 'invalid_file.csv'
+INVALID_TXT = TEST_DATA_DIR / 'invalid_file.txt'
+INVALID_FORMAT_TXT = TEST_DATA_DIR / 'invalid_format_file.txt'
+MALFORMED_CSV = TEST_DATA_DIR / 'malformed_file.csv'
+MISSING_IDENTIFIER_TXT = TEST_DATA_DIR / 'missing_identifier_file.txt'
+SINGLE_IDENTIFIER_TXT = TEST_DATA_DIR / 'single_identifier_file.txt'
+